@@ -1,126 +1,198 @@
 #!/usr/bin/env python3
 
 import argparse
+import queue
 import signal
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 from py_utils.datetime import duration_human
 from py_utils.dl_binaries import download_binaries, get_architecture, get_system
 from py_utils.misc import add_dir_to_path
-from tqdm import tqdm
 
-from py_ffmpeg.config import EncodingConfig
-from py_ffmpeg.encoder import EncodingState, VideoEncoder
+from py_ffmpeg.batch import BatchEncoder
+from py_ffmpeg.cli import ProgressBar
+from py_ffmpeg.config import EncodingConfig, default_config
+from py_ffmpeg.encoder import EncodingState, RateLimited
 from py_ffmpeg.media_info import MediaInfo  # Utilisé pour l'annotation de type
 
 # Instances globales pour y accéder depuis les callbacks et le gestionnaire de signal
-pbar: tqdm | None = None
-encoder_instance: VideoEncoder | None = None
+# Les barres de progression et états d'affichage sont indexés par fichier d'entrée (file_id)
+pbars: dict[str, ProgressBar] = {}
+batch_instance: BatchEncoder | None = None
+# Valeur provisoire, remplacée dans main() : la configuration n'est créée qu'une fois le PATH prêt
+progress_interval: float = 1.0
+progress_callbacks: dict[str, RateLimited] = {}
+last_progress: dict[str, tuple[int, int]] = {}
 
+# Les encodages tournent dans des threads dédiés : leurs callbacks sont postés ici et exécutés
+# par le thread principal, qui reste seul à manipuler les barres de progression.
+ui_events: queue.SimpleQueue = queue.SimpleQueue()
+progress_samples: dict[str, tuple[float, int]] = {}  # Seule la dernière valeur compte
+# Messages de fin, affichés sous les barres une fois celles-ci fermées
+final_messages: list[str] = []
 
-def on_progress_update(percent_complete: float, time_remaining_seconds: int):
+
+@lru_cache(maxsize=256)
+def _fmt_eta(seconds: int, short: bool = True) -> str:
+    """Formatage du temps restant, mémorisé car l'ETA varie peu d'une mise à jour à l'autre."""
+    return duration_human(seconds, short=short)
+
+
+def on_progress_update(file_id: str, percent_complete: float, time_remaining_seconds: int):
     """Callback pour mettre à jour la barre de progression."""
-    global pbar
+    pbar = pbars.get(file_id)
     if pbar:
-        pbar.n = int(percent_complete)  # Met à jour la progression actuelle
+        # Pas de rafraîchissement si rien n'a changé à l'affichage
+        progress = (int(percent_complete), time_remaining_seconds)
+        if progress == last_progress.get(file_id):
+            return
+        last_progress[file_id] = progress
         if time_remaining_seconds > 0:
-            pbar.set_postfix_str(
-                f"{duration_human(time_remaining_seconds, short=True)}", refresh=True
-            )
+            postfix = _fmt_eta(int(time_remaining_seconds))
         else:
-            pbar.set_postfix_str("calcul...", refresh=True)
+            postfix = "calcul..."
+        pbar.update(progress[0], postfix)
 
 
-def on_state_changed(new_state: EncodingState):
+def on_state_changed(file_id: str, new_state: EncodingState):
     """Callback pour les changements d'état de l'encodeur."""
-    global pbar
+    pbar = pbars.get(file_id)
     status_text = str(new_state)  # Utilise la méthode __str__ de EncodingState
     if pbar:
-        pbar.set_description_str(status_text, refresh=True)
+        pbar.update(desc=f"{Path(file_id).name} : {status_text}", force=True)
     else:
         # Au cas où l'état changerait avant l'initialisation de pbar ou après sa fermeture
-        print(f"État: {status_text}")
+        print(f"{file_id} - État: {status_text}")
 
 
-def on_encoding_finished(success: bool, message: str, output_media_info: MediaInfo | None):
+def on_encoding_finished(
+    file_id: str, success: bool, message: str, output_media_info: MediaInfo | None
+):
     """Callback pour la fin de l'encodage."""
-    global pbar
+    if file_id in progress_samples:
+        # Applique la dernière progression reçue
+        on_progress_update(file_id, *progress_samples.pop(file_id))
+    pbar = pbars.get(file_id)
     if pbar:
         # Assure que la barre de progression atteint 100% en cas de succès
-        if success and pbar.n < 100:
-            pbar.n = 100
-            pbar.refresh()
-        pbar.close()
-        print("\n" + "=" * 30)  # Séparateur après la barre de progression
+        pbar.update(100 if success else None, "✅" if success else "❌", force=True)
 
     if success:
-        print(f"✅ Succès : {message}")
-        if output_media_info:
-            print(f"Fichier de sortie : {output_media_info.filepath}")
+        output = output_media_info.filepath if output_media_info else file_id
+        final_messages.append(f"✅ Succès : {message} Fichier de sortie : {output}")
     else:
-        print(f"❌ Échec/Annulation : {message}")
+        final_messages.append(f"❌ Échec/Annulation ({file_id}) : {message}")
 
 
 def sigint_handler(sig, frame):
     """Gestionnaire pour le signal SIGINT (Ctrl+C)."""
-    global encoder_instance, pbar
     print("\nInterruption détectée (Ctrl+C). Tentative d'annulation...")
-    if pbar and not pbar.disable:  # pbar.disable est True si pbar est fermé
-        pbar.set_description_str("Annulation en cours...", refresh=True)
-    if encoder_instance:
-        encoder_instance.cancel()
+    for pbar in pbars.values():
+        pbar.update(desc="Annulation en cours...", force=True)  # Sans effet si pbar est fermé
+    if batch_instance:
+        batch_instance.cancel()
     # Le callback on_encoding_finished sera appelé par VideoEncoder pour finaliser.
 
 
-def main(input_path: Path):
-    global pbar, encoder_instance
+def post_to_main_thread(fn):
+    """Retourne un callback qui poste l'appel de `fn` dans la file d'événements du thread principal."""
+    return lambda *args: ui_events.put((fn, args))
 
-    if not input_path.is_file():
-        print(f"Erreur : Fichier d'entrée non trouvé : {input_path}", file=sys.stderr)
-        sys.exit(1)
 
-    config = EncodingConfig()
-    output_path = Path(config.suggest_output_filepath(str(input_path)))
+def post_progress(file_id: str, percent: float, remaining: int):
+    """Callback de progression exécuté dans un thread d'encodage."""
+    if file_id not in progress_callbacks:
+        progress_callbacks[file_id] = RateLimited(
+            lambda *sample: progress_samples.__setitem__(file_id, sample),
+            progress_interval,
+        )
+    progress_callbacks[file_id](percent, remaining)
 
-    print(f"Vidéo d'entrée : {input_path.resolve()}")
-    print(f"Vidéo de sortie : {output_path.resolve()}")
 
-    encoder_instance = VideoEncoder(
-        input_path=str(input_path),
-        output_path=str(output_path),
-        # Les paramètres d'encodage par défaut de VideoEncoder seront utilisés
-    )
+def post_finished(file_id: str, *args):
+    """Callback de fin exécuté dans un thread d'encodage."""
+    if file_id in progress_callbacks:
+        progress_callbacks[file_id].flush()  # Délivre la dernière progression ignorée
+    ui_events.put((on_encoding_finished, (file_id, *args)))
+
+
+def process_ui_events(timeout: float = 0.0):
+    """Exécute, sur le thread principal, les événements postés par les threads d'encodage."""
+    try:
+        fn, args = ui_events.get(timeout=timeout) if timeout > 0 else ui_events.get_nowait()
+        while True:
+            fn(*args)
+            fn, args = ui_events.get_nowait()
+    except queue.Empty:
+        pass
+    for file_id in list(progress_samples):
+        on_progress_update(file_id, *progress_samples.pop(file_id))
+
+
+def main(input_paths: list[Path], config: EncodingConfig):
+    global batch_instance, progress_interval
+
+    for input_path in input_paths:
+        if not input_path.is_file():
+            print(f"Erreur : Fichier d'entrée non trouvé : {input_path}", file=sys.stderr)
+            sys.exit(1)
 
-    encoder_instance.on_progress_callback = on_progress_update
-    encoder_instance.on_state_changed_callback = on_state_changed
-    encoder_instance.on_finished_callback = on_encoding_finished
-    # Optionnel: encoder_instance.on_log_callback = lambda msg: print(f"LOG: {msg}")
+    progress_interval = config.progress_update_interval
+    batch_instance = BatchEncoder(input_paths, config)
+
+    for input_path in input_paths:
+        output_path = Path(config.suggest_output_filepath(str(input_path)))
+        print(f"Vidéo d'entrée : {input_path.resolve()}")
+        print(f"Vidéo de sortie : {output_path.resolve()}")
+
+    batch_instance.on_progress_callback = post_progress
+    batch_instance.on_state_changed_callback = post_to_main_thread(on_state_changed)
+    batch_instance.on_finished_callback = post_finished
+    # Optionnel: batch_instance.on_log_callback = lambda file_id, msg: print(f"LOG: {msg}")
 
     signal.signal(signal.SIGINT, sigint_handler)
 
     print("Démarrage de l'encodage... (Ctrl+C pour annuler)")
     try:
-        with tqdm(
-            total=100,
-            unit="%",
-            desc="Initialisation",
-            bar_format="{desc} |{bar}| {percentage:3.0f}% | {elapsed} | ETA: {postfix}",
-        ) as local_pbar:
-            pbar = local_pbar  # Assigner à la variable globale
-            encoder_instance.start()  # Appel bloquant
+        for i, file_id in enumerate(batch_instance.input_paths):
+            pbars[file_id] = ProgressBar(
+                total=100, desc=f"{Path(file_id).name} : Initialisation", position=i
+            )
+            pbars[file_id].refresh()
+        # Le thread principal reste disponible pour l'affichage et le signal SIGINT
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(batch_instance.start)
+            while not future.done():
+                process_ui_events(timeout=0.1)
+            process_ui_events()
+            future.result()  # Propage une éventuelle exception non interceptée
     except Exception as e:  # Gère les erreurs inattendues non interceptées par VideoEncoder
-        if pbar and not pbar.disable:
-            pbar.close()
         print(f"\nUne erreur inattendue est survenue hors de l'encodeur : {e}", file=sys.stderr)
+    finally:
+        for pbar in pbars.values():
+            pbar.close()
+        print("\n" * len(pbars) + "=" * 30)  # Séparateur sous les barres de progression
+        for message in final_messages:
+            print(message)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Encodeur vidéo CLI minimaliste avec py-ffmpeg.")
-    parser.add_argument("input_file", type=str, help="Chemin vers le fichier vidéo d'entrée.")
+    parser.add_argument(
+        "input_files", type=str, nargs="+", help="Chemin(s) vers le(s) fichier(s) vidéo d'entrée."
+    )
     parser.add_argument(
         "--download-binaries", "-b", action="store_true", help="Télécharge les binaires"
     )
+    parser.add_argument(
+        "--profile",
+        choices=["balanced", "fast", "realtime", "archival"],
+        default="balanced",
+        help="Profil de performance de l'encodage (libx264).",
+    )
     args = parser.parse_args()
 
     bin_dir = Path(__file__).parent.parent / "bin"
@@ -135,6 +207,9 @@ if __name__ == "__main__":
             filter_names=["ffmpeg", "ffprobe"],
         )
 
-    input_path = Path(args.input_file)
-
-    main(input_path)
+    config = (
+        default_config()
+        if args.profile == "balanced"
+        else EncodingConfig(performance_profile=args.profile)
+    )
+    main([Path(f) for f in args.input_files], config)
@@ -1,14 +1,17 @@
+import os
 import sys
-from pathlib import Path
+from collections import deque
+from functools import lru_cache
 
 from py_utils.datetime import duration_human
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, QTimer, Signal
 from PySide6.QtWidgets import (
     QApplication,
     QFileDialog,
     QFrame,
     QHBoxLayout,
     QLabel,
+    QMessageBox,
     QProgressBar,
     QPushButton,
     QTextEdit,
@@ -16,13 +19,19 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from py_ffmpeg.config import EncodingConfig
+from py_ffmpeg.config import default_config
 from py_ffmpeg.encoder import EncodingState, VideoEncoder
 from py_ffmpeg.ffprobe import FFprobe
 from py_ffmpeg.media_info import MediaInfo
 from py_ffmpeg.qthreads import EncoderWorker
 
 
+@lru_cache(maxsize=256)
+def _fmt_eta(seconds: int) -> str:
+    """Formatage du temps restant, mémorisé car l'ETA varie peu d'une mise à jour à l'autre."""
+    return duration_human(seconds)
+
+
 class EncoderViewModelSignals(QObject):
     log_updated = Signal(str)
     progress_updated = Signal(float, int)
@@ -41,31 +50,67 @@ class EncoderViewModel(QObject):
 
         self.signals = EncoderViewModelSignals()
 
+        # Le worker dépose la dernière progression ici, le timer la relève dans le thread GUI
+        self._last_progress: deque[tuple[float, int]] = deque(maxlen=1)
+        self._emitted_progress: tuple[float, int] | None = None
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(int(default_config().progress_update_interval * 1000))
+        self._poll_timer.timeout.connect(self._drain_progress)
+
+    @property
+    def input_path(self) -> str | None:
+        return self._input_path
+
+    @property
+    def output_path(self) -> str | None:
+        return self._output_path
+
     @property
-    def input_path(self):
-        return Path(self._input_path)
+    def input_path_name(self) -> str:
+        return os.path.basename(self._input_path)
 
     @property
-    def output_path(self):
-        return Path(self._output_path)
+    def input_dir(self) -> str:
+        return os.path.dirname(self._input_path)
+
+    @property
+    def output_path_name(self) -> str:
+        return os.path.basename(self._output_path)
+
+    @property
+    def output_dir(self) -> str:
+        return os.path.dirname(self._output_path)
 
     @input_path.setter
     def input_path(self, value):
         if self._input_path != value:
             self._input_path = value
-            self._output_path = EncodingConfig().suggest_output_filepath(value)
+            self._output_path = default_config().suggest_output_filepath(value)
             self._start_encoding()
 
     def _start_encoding(self):
         encoder = VideoEncoder(self._input_path, self._output_path)
-        self._encoder_worker = EncoderWorker(encoder)
+        self._encoder_worker = EncoderWorker(encoder, progress_buffer=self._last_progress)
         self._encoder_worker.signals.started_with_options.connect(self.signals.encoding_started)
-        self._encoder_worker.signals.finished.connect(self.signals.encoding_finished)
-        self._encoder_worker.signals.progress_updated.connect(self.signals.progress_updated)
+        self._encoder_worker.signals.finished.connect(self._on_encoding_finished)
         self._encoder_worker.signals.state_changed.connect(self.signals.state_changed)
         self._encoder_worker.signals.log_updated.connect(self.signals.log_updated)
+        self._emitted_progress = None
+        self._poll_timer.start()
         self._encoder_worker.start()
 
+    def _drain_progress(self):
+        if self._last_progress:
+            progress = self._last_progress.pop()
+            if progress != self._emitted_progress:
+                self._emitted_progress = progress
+                self.signals.progress_updated.emit(*progress)
+
+    def _on_encoding_finished(self, success, message, output_mediainfo):
+        self._poll_timer.stop()
+        self._drain_progress()
+        self.signals.encoding_finished.emit(success, message, output_mediainfo)
+
     def quit_cleanly(self):
         if self._encoder_worker:
             self._encoder_worker.cancel()
@@ -164,13 +209,13 @@ class Window(QWidget):
 
     def on_progress_updated(self, percent, remaining):
         self.progress_bar.setValue(int(percent))
-        self.remaining_time.setText(f"Temps restant : {duration_human(remaining)}")
+        self.remaining_time.setText(f"Temps restant : {_fmt_eta(int(remaining))}")
 
     def on_encoding_started(self, input_mediainfo, options):
         self.choose_btn.setVisible(False)
         self.cancel_btn.setVisible(True)
-        self.input_filename.setText(self.vm.input_path.name)
-        self.input_folder.setText(f"Dossier : {self.vm.input_path.parent}")
+        self.input_filename.setText(self.vm.input_path_name)
+        self.input_folder.setText(f"Dossier : {self.vm.input_dir}")
         self.input_data.setText(input_mediainfo.summary_str)
 
         self.input_infos.setVisible(True)
@@ -181,8 +226,8 @@ class Window(QWidget):
         self.cancel_btn.setVisible(False)
         self.progress.setVisible(False)
         if output_mediainfo:
-            self.output_filename.setText(self.vm.output_path.name)
-            self.output_folder.setText(f"Dossier : {self.vm.output_path.parent}")
+            self.output_filename.setText(self.vm.output_path_name)
+            self.output_folder.setText(f"Dossier : {self.vm.output_dir}")
             self.output_data.setText(output_mediainfo.summary_str)
         else:
             self.output_filename.setText(message)
@@ -192,9 +237,17 @@ class Window(QWidget):
         self.output_infos.setVisible(True)
 
     def choose_file(self):
-        self.vm.input_path, _ = QFileDialog.getOpenFileName(
-            self, "Sélectionner un fichier vidéo", "", EncodingConfig().get_file_filters()
+        input_path, _ = QFileDialog.getOpenFileName(
+            self, "Sélectionner un fichier vidéo", "", default_config().get_file_filters()
         )
+        if not input_path:
+            return
+        if not default_config().is_supported_input(input_path):
+            QMessageBox.warning(
+                self, "Format non supporté", f"Format non supporté : {input_path}"
+            )
+            return
+        self.vm.input_path = input_path
 
     def closeEvent(self, event):
         self.vm.quit_cleanly()
@@ -0,0 +1,136 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from py_ffmpeg.media_info import MediaInfo
+
+from .config import EncodingConfig, default_config
+from .encoder import EncodingState, VideoEncoder
+
+
+class BatchEncoder:
+    """
+    Encode une liste de fichiers en lançant jusqu'à `config.max_concurrent_encodings` encodages
+    en parallèle.
+
+    Chaque fichier est identifié dans les callbacks par son chemin d'entrée (`file_id`).
+    """
+
+    def __init__(
+        self,
+        input_paths: list[str | Path],
+        config: EncodingConfig | None = None,
+        ffmpeg_executable: str | None = None,
+        ffprobe_executable="ffprobe",
+    ):
+        self._config = config or default_config()
+        # Le file_id indexe les encodeurs : un fichier donné plusieurs fois (y compris sous deux
+        # écritures du même chemin) n'est encodé qu'une fois, sous sa première écriture
+        unique_paths: dict[str, str] = {}
+        for p in input_paths:
+            unique_paths.setdefault(os.path.abspath(p), str(p))
+        self._input_paths = list(unique_paths.values())
+        self._output_paths = self._assign_output_paths()
+        # Par défaut, le binaire sur lequel la configuration a détecté l'encodeur matériel
+        self._ffmpeg_executable = ffmpeg_executable or self._config.ffmpeg_executable
+        self._ffprobe_executable = ffprobe_executable
+        self._max_workers = max(
+            1, min(self._config.max_concurrent_encodings, len(self._input_paths))
+        )
+        self._encoders: dict[str, VideoEncoder] = {}
+        self._cancelled = False
+
+        # Callbacks, identiques à ceux de VideoEncoder mais préfixés par le file_id
+        self.on_log_callback: Callable[[str, str], None] | None = None
+        self.on_state_changed_callback: Callable[[str, EncodingState], None] | None = None
+        self.on_started_callback: Callable[[str, MediaInfo, dict], None] | None = None
+        self.on_progress_callback: Callable[[str, float, int], None] | None = None
+        self.on_finished_callback: Callable[[str, bool, str, MediaInfo | None], None] | None = None
+
+    @property
+    def input_paths(self) -> list[str]:
+        return self._input_paths
+
+    def output_path(self, file_id: str) -> str:
+        return self._output_paths[file_id]
+
+    def _assign_output_paths(self) -> dict[str, str]:
+        """
+        Associe un fichier de sortie distinct à chaque entrée : "a.mp4" et "a.mkv" donneraient
+        tous deux "a.reenc.mp4", la seconde reçoit alors "a.reenc-2.mp4".
+        """
+        output_paths: dict[str, str] = {}
+        used: set[str] = set()
+        for file_id in self._input_paths:
+            output_path = self._config.suggest_output_filepath(file_id)
+            stem, ext = os.path.splitext(output_path)
+            n = 1
+            while os.path.abspath(output_path) in used:
+                n += 1
+                output_path = f"{stem}-{n}{ext}"
+            used.add(os.path.abspath(output_path))
+            output_paths[file_id] = output_path
+        return output_paths
+
+    def _encoding_params(self) -> dict:
+        params = self._config.get_default_encoding_params()
+        if self._max_workers > 1:
+            # Répartition des cœurs entre les encodages pour éviter la sursouscription
+            params.setdefault("threads", str(max(1, (os.cpu_count() or 1) // self._max_workers)))
+        return params
+
+    def _forward(self, callback_name: str, file_id: str) -> Callable[..., None]:
+        """Retourne un callback pour VideoEncoder qui relaie ses arguments préfixés par file_id."""
+
+        def callback(*args):
+            fn = getattr(self, callback_name)
+            if fn:
+                fn(file_id, *args)
+
+        return callback
+
+    def _create_encoder(self, file_id: str) -> VideoEncoder:
+        encoder = VideoEncoder(
+            file_id,
+            self.output_path(file_id),
+            encoding_params=self._encoding_params(),
+            global_params=self._config.get_global_params(),
+            ffmpeg_executable=self._ffmpeg_executable,
+            ffprobe_executable=self._ffprobe_executable,
+        )
+        encoder.on_log_callback = self._forward("on_log_callback", file_id)
+        forward_state = self._forward("on_state_changed_callback", file_id)
+
+        def on_state_changed(state: EncodingState):
+            forward_state(state)
+            # cancel() a pu passer avant l'enregistrement de l'encodeur, ou tant qu'il était IDLE
+            # (annulation alors ignorée) : le lot est revérifié dès le début de la préparation
+            if state == EncodingState.PREPARING and self._cancelled:
+                encoder.cancel()
+
+        encoder.on_state_changed_callback = on_state_changed
+        encoder.on_started_callback = self._forward("on_started_callback", file_id)
+        encoder.on_progress_callback = self._forward("on_progress_callback", file_id)
+        encoder.on_finished_callback = self._forward("on_finished_callback", file_id)
+        return encoder
+
+    def _encode(self, file_id: str):
+        if self._cancelled:
+            return
+        encoder = self._create_encoder(file_id)
+        self._encoders[file_id] = encoder
+        encoder.start()
+
+    def start(self):
+        """Lance tous les encodages et bloque jusqu'à la fin du dernier."""
+        self._cancelled = False
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            for future in [executor.submit(self._encode, p) for p in self._input_paths]:
+                future.result()
+
+    def cancel(self):
+        """Annule les encodages en cours ; les fichiers pas encore démarrés sont ignorés."""
+        self._cancelled = True
+        for encoder in list(self._encoders.values()):
+            encoder.cancel()
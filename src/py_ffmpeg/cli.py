@@ -0,0 +1,90 @@
+import shutil
+import sys
+import time
+from typing import TextIO
+
+
+class ProgressBar:
+    """
+    Barre de progression minimaliste pour le terminal : `desc |████    |  42% | 01:23 | ETA: postfix`.
+
+    Le rendu n'est réécrit que si `interval` secondes se sont écoulées depuis le précédent, ce qui
+    limite les écritures quand les mises à jour sont très fréquentes. Plusieurs barres peuvent
+    cohabiter en leur attribuant des `position` différentes (une ligne chacune).
+    """
+
+    def __init__(
+        self,
+        total: int = 100,
+        interval: float = 0.1,
+        desc: str = "",
+        position: int = 0,
+        file: TextIO | None = None,
+    ):
+        self.total = total
+        self.n = 0
+        self.desc = desc
+        self.postfix = ""
+        self.position = position
+        self.closed = False
+        self._interval = interval
+        self._file = file or sys.stdout
+        self._columns = shutil.get_terminal_size().columns
+        self._start_time = time.monotonic()
+        self._last_draw: float | None = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def update(
+        self,
+        n: int | None = None,
+        postfix: str | None = None,
+        desc: str | None = None,
+        force: bool = False,
+    ):
+        """Met à jour la progression, le suffixe et/ou la description puis redessine la barre."""
+        if n is not None:
+            self.n = n
+        if postfix is not None:
+            self.postfix = postfix
+        if desc is not None:
+            self.desc = desc
+        self.refresh(force)
+
+    def refresh(self, force: bool = True):
+        """Redessine la barre, au plus une fois par `interval` sauf si `force` est vrai."""
+        if self.closed:
+            return
+        now = time.monotonic()
+        if not force and self._last_draw is not None and now - self._last_draw < self._interval:
+            return
+        self._last_draw = now
+
+        line = self._render(now)
+        if self.position:
+            # Descend jusqu'à la ligne de la barre, réécrit celle-ci puis remonte le curseur
+            out = "\n" * self.position + "\r" + line + f"\x1b[K\x1b[{self.position}A\r"
+        else:
+            out = "\r" + line + "\x1b[K"
+        self._file.write(out)
+        self._file.flush()
+
+    def _render(self, now: float) -> str:
+        ratio = min(1.0, self.n / self.total) if self.total else 0.0
+        minutes, seconds = divmod(int(now - self._start_time), 60)
+        left = f"{self.desc} |"
+        right = f"| {ratio * 100:3.0f}% | {minutes:02d}:{seconds:02d} | ETA: {self.postfix}"
+        width = max(0, self._columns - len(left) - len(right) - 1)
+        filled = int(width * ratio)
+        return (left + "█" * filled + " " * (width - filled) + right)[: self._columns - 1]
+
+    def close(self):
+        """Affiche l'état final de la barre ; les mises à jour suivantes sont ignorées."""
+        if self.closed:
+            return
+        self.refresh(force=True)
+        self.closed = True
@@ -1,24 +1,299 @@
+import atexit
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
+
+from .media_info import MediaInfo
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel, repli sur le module json standard
+    orjson = None
+
+# Encodeurs H.264 matériels testés, par ordre de préférence
+HW_VIDEO_ENCODERS = ("h264_nvenc", "h264_vaapi", "h264_videotoolbox")
+
+
+# Paramètres libx264 propres à chaque profil de performance
+_PROFILES: dict[str, dict[str, str]] = {
+    "balanced": {},
+    "fast": {"preset": "veryfast"},
+    "realtime": {"preset": "ultrafast", "tune": "zerolatency"},
+    "archival": {"preset": "slower"},
+}
+
+
+def _hw_encoder_args(encoder: str, vaapi_device: str) -> tuple[list[str], list[str]]:
+    """Retourne les arguments (globaux, de sortie) nécessaires à l'utilisation d'un encodeur matériel."""
+    if encoder == "h264_vaapi":
+        return ["-vaapi_device", vaapi_device], ["-vf", "format=nv12,hwupload"]
+    return [], []
+
+
+@lru_cache(maxsize=None)
+def _detect_hw_encoder(executable: str, vaapi_device: str) -> str | None:
+    """
+    Retourne le premier encodeur matériel H.264 réellement utilisable, ou None.
+
+    Un encodeur listé par `ffmpeg -encoders` peut être compilé sans que le matériel soit présent,
+    on valide donc chaque candidat par l'encodage d'une image de test.
+    Le résultat est mis en cache pour toute la durée du processus.
+    """
+    try:
+        listing = subprocess.run(
+            [executable, "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    available = {line.split()[1] for line in listing.splitlines() if len(line.split()) > 1}
+    for encoder in HW_VIDEO_ENCODERS:
+        if encoder not in available:
+            continue
+        global_args, output_args = _hw_encoder_args(encoder, vaapi_device)
+        command = [
+            executable,
+            "-hide_banner",
+            "-v",
+            "error",
+            *global_args,
+            "-f",
+            "lavfi",
+            "-i",
+            "color=size=256x256:duration=0.1",
+            *output_args,
+            "-c:v",
+            encoder,
+            "-frames:v",
+            "1",
+            "-f",
+            "null",
+            "-",
+        ]
+        try:
+            subprocess.run(command, capture_output=True, check=True, timeout=10)
+        except (OSError, subprocess.SubprocessError):
+            continue
+        return encoder
+    return None
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Décode du JSON avec orjson s'il est installé, le module json standard sinon."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Encode du JSON en UTF-8 avec orjson s'il est installé, le module json standard sinon."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
 
 
 @dataclass
+class MediaInfoCache:
+    """
+    Cache persistant des résultats de ffprobe, indexé par (chemin, taille, mtime).
+
+    Les données brutes de ffprobe sont conservées dans un dictionnaire en mémoire, chargé
+    depuis `cache_path` au premier accès, et réécrites sur le disque à la fin du processus.
+    Au-delà de `max_entries` fichiers, les entrées les moins récemment utilisées sont évincées ;
+    celles des fichiers supprimés sont retirées à l'écriture.
+    Avec `cache_path=None`, le cache est désactivé : rien n'est lu ni enregistré.
+    """
+
+    cache_path: Path | None = field(
+        default_factory=lambda: Path("~/.cache/py-ffmpeg/probe.json").expanduser()
+    )
+    max_entries: int = 1000
+
+    def __post_init__(self):
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        if self.cache_path is not None:
+            atexit.register(self.flush)
+
+    @staticmethod
+    def _stat_key(path: str | Path) -> tuple[str, int, int]:
+        st = os.stat(path)
+        return os.path.abspath(path), st.st_size, st.st_mtime_ns
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self._entries is None:
+            try:
+                entries = json_loads(self.cache_path.read_bytes())
+            except (OSError, ValueError):
+                entries = None
+            # Un fichier corrompu ou d'un autre format est ignoré
+            self._entries = entries if isinstance(entries, dict) else {}
+        return self._entries
+
+    def _get_entry(self, path: str | Path) -> dict[str, Any] | None:
+        """Retourne l'entrée du fichier si elle correspond toujours à sa taille et à son mtime."""
+        if self.cache_path is None:
+            return None
+        try:
+            abs_path, size, mtime_ns = self._stat_key(path)
+        except OSError:
+            return None
+        with self._lock:
+            entries = self._load()
+            entry = entries.pop(abs_path, None)
+            if entry is None:
+                return None
+            entries[abs_path] = entry  # Replacée en fin d'ordre : la plus récemment utilisée
+        if entry["size"] != size or entry["mtime_ns"] != mtime_ns:
+            return None
+        return entry
+
+    def _update_entry(self, path: str | Path, **values: Any):
+        """Met à jour l'entrée du fichier, en repartant d'une entrée vide si elle est périmée."""
+        if self.cache_path is None:
+            return
+        try:
+            abs_path, size, mtime_ns = self._stat_key(path)
+        except OSError:
+            return  # Fichier supprimé ou déplacé depuis son analyse : rien à mettre en cache
+        with self._lock:
+            entries = self._load()
+            entry = entries.pop(abs_path, None)
+            if entry is None or entry["size"] != size or entry["mtime_ns"] != mtime_ns:
+                entry = {"size": size, "mtime_ns": mtime_ns}
+            entry.update(values)
+            entries[abs_path] = entry
+            # Le dictionnaire conserve l'ordre d'utilisation : les premières clés sont les plus
+            # anciennes
+            while len(entries) > self.max_entries:
+                del entries[next(iter(entries))]
+            self._dirty = True
+
+    def get(
+        self, path: str | Path, probe_args: tuple[str, ...] | None = None
+    ) -> MediaInfo | None:
+        """
+        Retourne le MediaInfo en cache pour ce fichier, ou None s'il est absent ou périmé.
+        Si `probe_args` est donné, l'entrée doit avoir été obtenue avec ces mêmes options ffprobe.
+        """
+        entry = self._get_entry(path)
+        if entry is None or "probe" not in entry:
+            return None
+        if probe_args is not None and entry.get("probe_args") != list(probe_args):
+            return None
+        return MediaInfo(path, entry["probe"])
+
+    def put(self, path: str | Path, info: MediaInfo, probe_args: tuple[str, ...] = ()):
+        """Enregistre les données brutes de ffprobe associées à ce fichier et les options utilisées."""
+        self._update_entry(path, probe=info._raw_probe_data, probe_args=list(probe_args))
+
+    def get_keyframes(self, path: str | Path) -> list[float] | None:
+        """Retourne les timestamps (en secondes) des images clés en cache pour ce fichier."""
+        entry = self._get_entry(path)
+        if entry is None:
+            return None
+        return entry.get("keyframes")
+
+    def put_keyframes(self, path: str | Path, keyframes: list[float]):
+        """Enregistre les timestamps des images clés de ce fichier."""
+        self._update_entry(path, keyframes=keyframes)
+
+    def clear(self):
+        """Vide le cache ; le fichier est réécrit vide au prochain flush()."""
+        if self.cache_path is None:
+            return
+        with self._lock:
+            self._entries = {}
+            self._dirty = True
+
+    def flush(self):
+        """Écrit le cache sur le disque s'il a été modifié."""
+        with self._lock:
+            if not self._dirty or self.cache_path is None:
+                return
+            self._dirty = False
+            # Les fichiers supprimés ou déplacés depuis leur analyse n'ont plus rien à faire ici
+            self._entries = {p: e for p, e in self._entries.items() if os.path.exists(p)}
+            tmp_name = None
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                # Fichier temporaire unique : deux processus peuvent écrire le cache en même temps
+                with tempfile.NamedTemporaryFile(
+                    dir=self.cache_path.parent, prefix=".probe-", delete=False
+                ) as tmp_file:
+                    tmp_name = tmp_file.name
+                    tmp_file.write(json_dumps(self._entries))
+                os.replace(tmp_name, self.cache_path)
+            except OSError:
+                # Cache non inscriptible (HOME en lecture seule...) : l'écriture est abandonnée
+                if tmp_name is not None:
+                    with contextlib.suppress(OSError):
+                        os.unlink(tmp_name)
+
+
+def _ffmpeg_executable_from_env() -> str:
+    """Exécutable ffmpeg indiqué par FFMPEG_EXECUTABLE, lu à la création de chaque configuration."""
+    return os.getenv("FFMPEG_EXECUTABLE", "ffmpeg")
+
+
+@lru_cache(maxsize=1)
+def default_media_info_cache() -> MediaInfoCache:
+    """
+    Instance de MediaInfoCache partagée par toutes les configurations et par FFprobe.
+
+    La variable d'environnement PY_FFMPEG_PROBE_CACHE permet d'indiquer un autre fichier, ou de
+    désactiver le cache ("off", "0").
+    """
+    location = os.getenv("PY_FFMPEG_PROBE_CACHE")
+    if location is None:
+        return MediaInfoCache()
+    if location.strip().lower() in ("", "0", "off", "false", "no"):
+        return MediaInfoCache(cache_path=None)
+    return MediaInfoCache(Path(location).expanduser())
+
+
+@dataclass(frozen=True, slots=True)
 class EncodingConfig:
     """Configuration for video encoding operations"""
 
     # Default encoding parameters
-    default_video_codec: str = "libx264"
+    default_video_codec: str | None = None  # None : encodeur matériel détecté, sinon libx264
     default_audio_codec: str = "aac"
     default_container: str = "mp4"
     default_crf: int = 23
     default_preset: str = "medium"
+    performance_profile: Literal["balanced", "fast", "realtime", "archival"] = "balanced"
+    ffmpeg_threads: int = 0  # 0 : choix automatique par ffmpeg
+    filter_threads: int = 0
+
+    # Hardware encoding settings
+    force_software: bool = False  # Désactive la détection d'un encodeur matériel (codec auto)
+    # Sert à la détection matérielle comme aux encodages, pour qu'ils utilisent le même binaire
+    ffmpeg_executable: str = field(default_factory=_ffmpeg_executable_from_env)
+    vaapi_device: str = "/dev/dri/renderD128"
 
     # Input/Output settings
-    supported_input_formats: list[str] = field(
-        default_factory=lambda: ["*.mp4", "*.avi", "*.mkv", "*.mov", "*.wmv", "*.flv"]
+    supported_input_formats: tuple[str, ...] = (
+        "*.mp4",
+        "*.avi",
+        "*.mkv",
+        "*.mov",
+        "*.wmv",
+        "*.flv",
     )
-    supported_output_formats: list[str] = field(default_factory=lambda: ["*.mp4", "*.mkv"])
+    supported_output_formats: tuple[str, ...] = ("*.mp4", "*.mkv")
 
     # Processing settings
     max_concurrent_encodings: int = 1
@@ -29,25 +304,152 @@ class EncodingConfig:
     output_suffix: str = ".reenc"
     log_max_lines: int = 1000
 
-    def get_default_encoding_params(self) -> dict[str, Any]:
-        """Get default FFmpeg encoding parameters"""
+    # Probing settings
+    enable_keyframe_cache: bool = True
+    media_info_cache: MediaInfoCache = field(
+        default_factory=default_media_info_cache, repr=False, compare=False
+    )
+
+    # Valeurs dérivées, calculées une seule fois dans __post_init__
+    _file_filters: str = field(init=False, repr=False, compare=False)
+    _default_output_ext: str = field(init=False, repr=False, compare=False)
+    _output_name_suffix: str = field(init=False, repr=False, compare=False)
+    _input_extensions: frozenset[str] = field(init=False, repr=False, compare=False)
+    # Calculées au premier besoin : la détection matérielle lance jusqu'à trois encodages de test
+    _video_codec: str | None = field(init=False, default=None, repr=False, compare=False)
+    _default_params: dict[str, Any] | None = field(
+        init=False, default=None, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        if self.performance_profile not in _PROFILES:
+            raise ValueError(
+                f"Profil de performance invalide. Choisir parmi : {', '.join(_PROFILES)}"
+            )
+
+        input_formats = " ".join(self.supported_input_formats)
+        object.__setattr__(
+            self, "_file_filters", f"Fichiers vidéo ({input_formats});;Tous les fichiers (*)"
+        )
+        # Chaînes internées : suggest_output_filepath ne fait plus que des concaténations
+        object.__setattr__(self, "_default_output_ext", sys.intern(f".{self.default_container}"))
+        object.__setattr__(
+            self, "_output_name_suffix", sys.intern(self.output_suffix + self._default_output_ext)
+        )
+        # Extensions en minuscules (".mp4", ".avi"...) déduites des motifs du sélecteur de fichiers
+        object.__setattr__(
+            self,
+            "_input_extensions",
+            frozenset(p.lower().removeprefix("*") for p in self.supported_input_formats),
+        )
+
+    @property
+    def video_codec(self) -> str:
+        """Video codec actually used, resolving the automatic choice on first access"""
+        if self._video_codec is None:
+            # Un codec choisi explicitement (y compris "libx264") est toujours conservé
+            codec = self.default_video_codec
+            if codec is None and not self.force_software:
+                codec = _detect_hw_encoder(self.ffmpeg_executable, self.vaapi_device)
+            object.__setattr__(self, "_video_codec", codec or "libx264")
+        return self._video_codec
+
+    def _build_encoding_params(self) -> dict[str, Any]:
+        params = self._build_codec_params()
+        if self.ffmpeg_threads:
+            params["threads"] = str(self.ffmpeg_threads)
+        return params
+
+    def _build_codec_params(self) -> dict[str, Any]:
+        codec = self.video_codec
+        if codec == "h264_nvenc":
+            return {
+                "c:v": codec,
+                "c:a": self.default_audio_codec,
+                "preset": "p4",
+                "rc": "vbr",
+                "cq": str(self.default_crf),
+            }
+        if codec == "h264_vaapi":
+            return {
+                "c:v": codec,
+                "c:a": self.default_audio_codec,
+                "vf": "format=nv12,hwupload",
+                "qp": str(self.default_crf),
+            }
+        if codec == "h264_videotoolbox":
+            # Qualité constante de 1 à 100 (100 = meilleure) : transposition de l'échelle CRF 0-51
+            quality = max(1, min(100, round(100 - self.default_crf * 100 / 51)))
+            return {
+                "c:v": codec,
+                "c:a": self.default_audio_codec,
+                "q:v": str(quality),
+            }
+        # Le profil de performance ne concerne que l'encodeur logiciel
         return {
-            "c:v": self.default_video_codec,
+            "c:v": codec,
             "c:a": self.default_audio_codec,
             "crf": str(self.default_crf),
             "preset": self.default_preset,
-        }
+        } | _PROFILES[self.performance_profile]
+
+    def get_default_encoding_params(self) -> dict[str, Any]:
+        """Get default FFmpeg encoding parameters"""
+        # Copie : VideoEncoder modifie le dictionnaire reçu (update_encoding_params)
+        if self._default_params is None:
+            object.__setattr__(self, "_default_params", self._build_encoding_params())
+        return dict(self._default_params)
+
+    def get_global_params(self) -> dict[str, Any]:
+        """Get FFmpeg global parameters required by the selected encoder"""
+        params = {}
+        if self.video_codec == "h264_vaapi":
+            params["vaapi_device"] = self.vaapi_device
+        if self.filter_threads:
+            params["filter_threads"] = str(self.filter_threads)
+        return params
+
+    def get_cached_media_info(self, input_filepath: str | Path) -> MediaInfo | None:
+        """Get the cached MediaInfo of a file, if it has already been probed"""
+        return self.media_info_cache.get(input_filepath)
+
+    def get_keyframes(
+        self, input_filepath: str | Path, ffprobe_executable: str = "ffprobe"
+    ) -> list[float]:
+        """Get the keyframe timestamps of the main video stream, probing them only once"""
+        # Import local : ffprobe dépend lui-même de ce module
+        from .ffprobe import FFprobe
+
+        if self.enable_keyframe_cache:
+            keyframes = self.media_info_cache.get_keyframes(input_filepath)
+            if keyframes is not None:
+                return keyframes
+
+        keyframes = FFprobe(ffprobe_executable).keyframes(input_filepath)
+        if self.enable_keyframe_cache:
+            self.media_info_cache.put_keyframes(input_filepath, keyframes)
+        return keyframes
 
     def get_file_filters(self) -> str:
         """Get file dialog filters string"""
-        input_formats = " ".join(self.supported_input_formats)
-        return f"Fichiers vidéo ({input_formats});;Tous les fichiers (*)"
+        return self._file_filters
+
+    def is_supported_input(self, input_filepath: str | Path) -> bool:
+        """Check whether a file has one of the supported input extensions"""
+        return os.path.splitext(input_filepath)[1].lower() in self._input_extensions
 
     def suggest_output_filepath(self, input_filepath: str | Path | None) -> str:
         """Suggest an output filename based on the input filename"""
         if not input_filepath:
-            return f"output{self.output_suffix}.{self.default_container}"
-        file_path = Path(input_filepath)
-        return str(
-            file_path.parent / f"{file_path.stem}{self.output_suffix}.{self.default_container}"
-        )
+            return "output" + self._output_name_suffix
+        directory, basename = os.path.split(os.fspath(input_filepath))
+        stem, _ = os.path.splitext(basename)
+        if not directory:
+            return stem + self._output_name_suffix
+        return os.path.join(directory, stem + self._output_name_suffix)
+
+
+@lru_cache(maxsize=1)
+def default_config() -> EncodingConfig:
+    """Instance d'EncodingConfig par défaut, partagée au sein du processus."""
+    return EncodingConfig()
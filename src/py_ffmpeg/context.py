@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 from datetime import datetime
 import traceback
 
@@ -12,24 +13,35 @@ from .media_info import MediaInfo
 FFMPEG_EXECUTABLE = os.getenv("FFMPEG_EXECUTABLE", "ffmpeg")
 FFPROBE_EXECUTABLE = os.getenv("FFPROBE_EXECUTABLE", "ffprobe")
 
+# Attributs propres à FFmpeg, jamais recherchés dans les informations du média
+_NON_MEDIA_ATTRIBUTES = frozenset({"arguments", "options"})
+
 
 class FFmpegContext(FFmpeg):
     def __init__(self, executable: str = FFMPEG_EXECUTABLE, *args, **kwargs):
         # Récupération d'éventuels arguments spécifiques pour ffprobe en les supprimant de kwargs avant de les envoyer à FFmpeg
         self._ffprobe_executable = kwargs.pop("ffprobe_executable", FFPROBE_EXECUTABLE)
+        # Conservé pour compatibilité : le probing est désormais différé jusqu'au premier accès
         self._prevent_auto_probing = kwargs.pop("prevent_auto_probing", False)
         _input = kwargs.pop("input", None)
 
-        super().__init__(*args, **kwargs)
-
+        # Initialisés avant FFmpeg.__init__ pour que __getattr__ ne soit jamais sollicité pour eux
         self._media_info: MediaInfo | None = None
+        self._media_info_loaded = False
+        self._attr_map: dict[str, tuple[object | None, str]] = {}
+        self._main_video_stream = None
+        self._main_audio_stream = None
         self._start_time: datetime | None = None
+        self._start_time_monotonic: float | None = None  # Pour les calculs de durée écoulée
+
+        super().__init__(executable, *args, **kwargs)
 
         if _input:
             self.input(_input)
 
     def execute(self, *args, **kwargs):
         self._start_time = datetime.now()
+        self._start_time_monotonic = time.monotonic()
         super().execute(*args, **kwargs)
 
     def first_input_url(self) -> str:
@@ -40,17 +52,25 @@ class FFmpegContext(FFmpeg):
     def probe(self) -> MediaInfo:
         ffprober = FFprobe(self._ffprobe_executable)
         self._media_info = ffprober.probe(self.first_input_url())
+        self._media_info_loaded = True
+        self._main_video_stream = self._media_info.main_video_stream
+        self._main_audio_stream = self._media_info.main_audio_stream
+        self._attr_map.clear()
         return self._media_info
 
-    def input(self, *args, **kwargs):
-        super().input(*args, **kwargs)
-        if len(self._options._input_files) == 1 and not self._prevent_auto_probing:
+    def invalidate_media_info(self):
+        """Force une nouvelle analyse du fichier d'entrée au prochain accès à ses informations."""
+        self._media_info_loaded = False
+
+    def _ensure_probed(self):
+        """Analyse le premier fichier d'entrée lors du premier accès à ses informations."""
+        if not self._media_info_loaded and self._options._input_files:
             self.probe()
-        return self
 
     @property
     def media_info(self) -> MediaInfo | None:
         """Accès direct à l'objet MediaInfo analysé."""
+        self._ensure_probed()
         return self._media_info
 
     @property
@@ -66,41 +86,50 @@ class FFmpegContext(FFmpeg):
         Retourne une information spécifique du fichier vidéo.
         Prend en charge les attributs directs de MediaInfo ou les chemins de type 'stream_type.attribute'.
         """
+        self._ensure_probed()
         if self._media_info is None:
             raise FFmpegError(
                 "Aucune information vidéo disponible. Assurez-vous d'avoir appelé 'probe()' ou 'input()' avec un fichier."
             )
 
+        # Le chemin d'un attribut n'est analysé qu'une fois, les accès suivants sont une simple
+        # recherche dans le dictionnaire
+        resolved = self._attr_map.get(attr)
+        if resolved is None:
+            resolved = self._attr_map[attr] = self._resolve_attr(attr)
+        source, source_attr = resolved
+
+        if source is None:
+            return default  # Le stream demandé n'existe pas
+        return getattr(source, source_attr, default)
+
+    def _resolve_attr(self, attr: str) -> tuple[object | None, str]:
+        """Retourne l'objet portant l'attribut demandé et le nom de l'attribut sur cet objet."""
         # Gérer les chemins de type 'stream_type.attribute'
         if "." in attr:
-            parts = attr.split(".", 1)
-            if len(parts) == 2:
-                stream_type, stream_attr = parts
-                if stream_type == "format":
-                    source = self._media_info.format
-                elif stream_type == "video_stream":  # Utiliser le nom de la propriété MediaInfo
-                    source = self._media_info.main_video_stream
-                elif stream_type == "audio_stream":  # Utiliser le nom de la propriété MediaInfo
-                    source = self._media_info.main_audio_stream
-                else:
-                    # Permettre d'accéder à d'autres types de streams si nécessaire (ex: data.tags)
-                    if (
-                        stream_type in self._media_info.streams
-                        and self._media_info.streams[stream_type]
-                    ):
-                        source = self._media_info.streams[stream_type][0]  # Premier stream du type
-                    else:
-                        raise FFmpegError(f"Type de flux inconnu ou non disponible : {stream_type}")
-
-                if source is None:
-                    return default  # Le stream demandé n'existe pas
-                return getattr(source, stream_attr, default)
+            stream_type, stream_attr = attr.split(".", 1)
+            if stream_type == "format":
+                return self._media_info.format, stream_attr
+            if stream_type == "video_stream":  # Utiliser le nom de la propriété MediaInfo
+                return self._main_video_stream, stream_attr
+            if stream_type == "audio_stream":  # Utiliser le nom de la propriété MediaInfo
+                return self._main_audio_stream, stream_attr
+            # Permettre d'accéder à d'autres types de streams si nécessaire (ex: data.tags)
+            if stream_type in self._media_info.streams and self._media_info.streams[stream_type]:
+                # Premier stream du type
+                return self._media_info.streams[stream_type][0], stream_attr
+            raise FFmpegError(f"Type de flux inconnu ou non disponible : {stream_type}")
 
         # Sinon, tenter d'accéder directement à l'attribut de MediaInfo
-        return getattr(self._media_info, attr, default)
+        return self._media_info, attr
 
     def __getattr__(self, name: str):
         """Accès dynamique aux attributs du fichier media."""
+        # Les attributs internes (y compris ceux de FFmpeg pas encore initialisés) ne doivent
+        # jamais déclencher le probing
+        if name.startswith("_") or name in _NON_MEDIA_ATTRIBUTES:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'.")
+
         value = self.getinfo(name)
 
         # Si l'attribut n'existe vraiment pas, lever AttributeError
@@ -1,12 +1,15 @@
+import shlex
+import time
 import traceback
-from datetime import datetime
 from enum import Enum, auto
+from functools import lru_cache
 from logging import getLogger
 from pathlib import Path
 from typing import Any, Callable
 
 from ffmpeg.errors import FFmpegError
 
+from py_ffmpeg.config import default_config
 from py_ffmpeg.ffprobe import FFprobe
 from py_ffmpeg.media_info import MediaInfo
 
@@ -23,24 +26,31 @@ class EncodingState(Enum):
     ERROR = auto()
 
     def __str__(self) -> str:
-        _display_texts = {
-            EncodingState.IDLE: "Inactif",
-            EncodingState.PREPARING: "Préparation en cours",
-            EncodingState.ENCODING: "Encodage en cours",
-            EncodingState.CANCELLING: "Annulation en cours",
-            EncodingState.CANCELLED: "Annulé",
-            EncodingState.COMPLETED: "Terminé",
-            EncodingState.ERROR: "Erreur",
-        }
         # Retourne le texte correspondant ou le nom du membre par défaut si non trouvé
         # Usage : print(str(encoding_state))
-        return _display_texts.get(self, self.name)
+        return _display_for(self)
 
     @property
     def display_text(self) -> str:
         return str(self)
 
 
+_STATE_DISPLAY = {
+    EncodingState.IDLE: "Inactif",
+    EncodingState.PREPARING: "Préparation en cours",
+    EncodingState.ENCODING: "Encodage en cours",
+    EncodingState.CANCELLING: "Annulation en cours",
+    EncodingState.CANCELLED: "Annulé",
+    EncodingState.COMPLETED: "Terminé",
+    EncodingState.ERROR: "Erreur",
+}
+
+
+@lru_cache(maxsize=None)
+def _display_for(state: EncodingState) -> str:
+    return _STATE_DISPLAY.get(state, state.name)
+
+
 class EncodingSettings:
     """
     Représente les paramètres d'encodage vidéo.
@@ -115,6 +125,37 @@ class EncodingSettings:
         return self._output_format
 
 
+class RateLimited:
+    """
+    Limite la fréquence d'appel d'un callback à un appel toutes les `min_interval_s` secondes.
+
+    Les appels trop rapprochés sont ignorés, mais les arguments du dernier d'entre eux sont conservés
+    afin de pouvoir être délivrés par `flush()` (par exemple à la fin de l'encodage).
+    """
+
+    def __init__(self, fn: Callable[..., None], min_interval_s: float):
+        self._fn = fn
+        self._min_interval_s = min_interval_s
+        self._last_call: float | None = None
+        self._pending: tuple | None = None
+
+    def __call__(self, *args):
+        now = time.monotonic()
+        if self._last_call is None or now - self._last_call >= self._min_interval_s:
+            self._last_call = now
+            self._pending = None
+            self._fn(*args)
+        else:
+            self._pending = args
+
+    def flush(self):
+        """Délivre le dernier appel ignoré, s'il y en a un."""
+        if self._pending is not None:
+            args, self._pending = self._pending, None
+            self._last_call = time.monotonic()
+            self._fn(*args)
+
+
 class VideoEncodingError(Exception):
     pass
 
@@ -134,20 +175,27 @@ class VideoEncoder:
         output_path: str,
         encoding_params: dict[str, Any] | None = None,
         input_params: dict[str, Any] | None = None,
-        ffmpeg_executable="ffmpeg",
+        global_params: dict[str, Any] | None = None,
+        ffmpeg_executable: str | None = None,
         ffprobe_executable="ffprobe",
     ):
         self._input_path = Path(input_path)
         self._output_path = Path(output_path)
         self._input_params = input_params
+        self._global_params = global_params or {}
         self._encoding_params = encoding_params or {}  # DEFAULT_ENCODING_PARAMS
         self._options_used = None
         self._current_state: EncodingState = EncodingState.IDLE
         self._error_details: str = ""
-        self._ffmpeg_executable = ffmpeg_executable
+        # Par défaut, le binaire de la configuration (celui utilisé pour choisir le codec)
+        self._ffmpeg_executable = ffmpeg_executable or default_config().ffmpeg_executable
         self._ffprobe_executable = ffprobe_executable
+        self._logger = getLogger(__name__)
 
         self._ffmpeg: FFmpegContext | None = None
+        self._ffmpeg_listeners: list[tuple[str, Callable]] = []
+        self._output_media_info: MediaInfo | None = None
+        self._last_ffmpeg_message = ""  # Dernière ligne de stderr hors progression/statistiques
         self._cancelled = False
 
         # Callbacks for notifying progress, logs, and completion
@@ -161,7 +209,7 @@ class VideoEncoder:
         if self.on_log_callback:
             self.on_log_callback(msg)
         else:
-            getLogger().info(msg)
+            self._logger.info(msg)
 
     def _set_state(self, new_state: EncodingState):
         if self._current_state != new_state:
@@ -183,6 +231,7 @@ class VideoEncoder:
 
     def start(self):
         self._cancelled = False
+        self._output_media_info = None
         self._set_state(EncodingState.PREPARING)
         try:
 
@@ -190,9 +239,14 @@ class VideoEncoder:
             self._setup_ffmpeg()
             self._setup_ffmpeg_callbacks()
 
+            if self._cancelled:
+                # Annulation reçue pendant la préparation : ffmpeg n'est pas lancé
+                self._handle_processing_result()
+                return
+
             self._log(f"Début de l'encodage avec la commande :")
-            self._log(" ".join(self._ffmpeg.arguments))
-            # L'état ENCODING sera défini dans on_stderr lorsque les options sont détectées
+            self._log(shlex.join(self._ffmpeg.arguments))  # Commande reproductible telle quelle
+            # L'état ENCODING sera défini dans on_progress à la réception du premier bloc
             self._ffmpeg.execute()
 
             self._handle_processing_result()
@@ -200,29 +254,58 @@ class VideoEncoder:
         except ValidationException as e:
             self._handle_error(f"Erreur de validation : {e}")
         except FFmpegError as e:
-            self._handle_error(f"Erreur lors de l'exécution de FFmpeg : {e}")
+            # FFmpegError reprend la dernière ligne de stderr, souvent une ligne de progression :
+            # le dernier message de log de ffmpeg est plus parlant
+            self._handle_error(
+                f"Erreur lors de l'exécution de FFmpeg : {self._last_ffmpeg_message or e}"
+            )
         except Exception as e:
             print(traceback.format_exc())
             self._handle_error(f"Erreur inattendue lors de l'encodage : {e}")
 
     def _validate_input(self):
-        if not Path(self._input_path).exists():
-            raise ValidationException(f"Fichier source inexistant: {self._input_path}")
+        # _input_path est déjà un Path : un seul appel système, sans conversion de chemin
+        try:
+            self._input_path.stat()
+        except OSError:  # Absent, chemin invalide ou inaccessible, comme l'ancien exists()
+            raise ValidationException(f"Fichier source inexistant: {self._input_path}") from None
 
     def _setup_ffmpeg(self):
-        self._ffmpeg = (
+        # Le contexte n'est construit qu'une fois ; une nouvelle exécution ne réinitialise que
+        # l'état propre à l'exécution précédente
+        if self._ffmpeg is None:
+            self._ffmpeg = self._build_ffmpeg()
+        else:
+            self._reset_ffmpeg_state()
+
+        if not self._ffmpeg.has_video_stream:
+            raise ValidationException(
+                f"Le fichier {self._input_path} ne contient pas de piste vidéo."
+            )
+
+    def _build_ffmpeg(self) -> FFmpegContext:
+        ffmpeg = (
             FFmpegContext(
                 executable=self._ffmpeg_executable, ffprobe_executable=self._ffprobe_executable
             )
             .input(str(self._input_path), options=self._input_params)
             .output(str(self._output_path), options=self._encoding_params)
             .option("y")
+            # Progression au format `clé=valeur` sur stderr ; les statistiques lisibles sont
+            # conservées pour l'évènement "progress" de python-ffmpeg
+            .option("progress", "pipe:2")
         )
-
-        if not self._ffmpeg.has_video_stream:
-            raise ValidationException(
-                f"Le fichier {self._input_path} ne contient pas de piste vidéo."
-            )
+        for key, value in self._global_params.items():
+            ffmpeg.option(key, value)
+        return ffmpeg
+
+    def _reset_ffmpeg_state(self):
+        """Retire les observers de l'exécution précédente et force la revalidation du probe."""
+        for event, listener in self._ffmpeg_listeners:
+            if listener in self._ffmpeg.listeners(event):
+                self._ffmpeg.remove_listener(event, listener)
+        self._ffmpeg_listeners.clear()
+        self._ffmpeg.invalidate_media_info()
 
     def _handle_error(self, msg: str):
         self._error_details = msg
@@ -230,42 +313,87 @@ class VideoEncoder:
             self.on_finished_callback(False, msg, None)
 
     def _setup_ffmpeg_callbacks(self):
-        if self.on_progress_callback:
-
-            @self._ffmpeg.on("progress")
-            def on_progress(progress):
-                if self._cancelled:
-                    return None
-
-                remaining = 0
-                if self._ffmpeg._start_time:
-                    elapsed = (datetime.now() - self._ffmpeg._start_time).seconds
-                    processed = progress.time.seconds
-                    speed = processed / elapsed if elapsed > 0 else 0
-                    remaining = int((self._ffmpeg.duration - processed) / speed) if speed > 0 else 0
-
-                percent = 0
-                if hasattr(self._ffmpeg, "nb_frames") and self._ffmpeg.nb_frames > 0:
-                    percent = min(100, (progress.frame / self._ffmpeg.nb_frames) * 100)
-
-                self.on_progress_callback(percent, remaining)
-
-            @self._ffmpeg.on("stderr")
-            def on_stderr(line):
-                """Au démarrage de ffmpeg, un observer analyse la sortie d'erreur jusqu'à voir la ligne contenant
-                "options:" qui indique les paramètres x264 qui seront utilisés pour l'encodage (que l'on récupère).
-
-                À ce niveau là, ffmpeg a validé l'input, les paramètres d'encodage et l'output, donc on peut considérer
-                qu'on est dans l'état d'ENCODING.
-                """
-                if "options:" in line:
-                    options_str = line.split("options:")[1].strip()
-                    self._options_used = dict(x.split("=") for x in options_str.split(" "))
-                    self._set_state(EncodingState.ENCODING)
-                    if self.on_started_callback:
-                        self.on_started_callback(self.input_mediainfo, self._options_used)
-                    # Once options are found, remove the listener
-                    self._ffmpeg.remove_listener("stderr", on_stderr)
+        # Valeurs fixes pendant tout l'encodage : lues une seule fois plutôt qu'à chaque tick
+        nb_frames = self._ffmpeg.getinfo("nb_frames", 0) or 0
+        duration = self._ffmpeg.getinfo("duration", 0) or 0
+        inv_nb_frames = 100.0 / nb_frames if nb_frames > 0 else None
+
+        progress_block: dict[str, str] = {}
+        self._options_used = None
+        self._last_ffmpeg_message = ""
+
+        @self._ffmpeg.on("stderr")
+        def on_progress(line):
+            """Accumule les lignes `clé=valeur` émises par `-progress pipe:2` jusqu'à la ligne
+            `progress=continue` (ou `progress=end`) qui clôt chaque bloc, puis notifie la
+            progression.
+
+            Le premier bloc signifie que ffmpeg a validé l'input, les paramètres d'encodage et
+            l'output, quel que soit l'encodeur : on passe alors dans l'état ENCODING.
+            """
+            line = line.strip()
+            key, sep, value = line.partition("=")
+            if not sep or " " in key:
+                # Ligne de log habituelle de ffmpeg, conservée pour le message d'erreur
+                if line:
+                    self._last_ffmpeg_message = line
+                return
+            if "=" in value:
+                return  # Statistiques lisibles (`frame=... fps=... time=...`)
+            if key != "progress":
+                progress_block[key] = value
+                return
+            if self._cancelled:
+                return None
+            if self._current_state == EncodingState.PREPARING:
+                self._notify_started()
+            if not self.on_progress_callback:
+                progress_block.clear()
+                return
+
+            out_time_us = progress_block.get("out_time_us", "")
+            processed = int(out_time_us) / 1_000_000 if out_time_us.isdigit() else 0.0
+            frame = progress_block.get("frame", "")
+            frame = int(frame) if frame.isdigit() else 0
+            progress_block.clear()
+
+            remaining = 0
+            start_time = self._ffmpeg._start_time_monotonic
+            if start_time is not None:
+                elapsed = time.monotonic() - start_time
+                speed = processed / elapsed if elapsed > 0 else 0
+                remaining = int((duration - processed) / speed) if speed > 0 else 0
+
+            percent = 0
+            if inv_nb_frames is not None:
+                percent = min(100.0, frame * inv_nb_frames)
+
+            self.on_progress_callback(percent, remaining)
+
+        @self._ffmpeg.on("stderr")
+        def on_x264_options(line):
+            """Récupère, pour libx264 uniquement, la ligne "options:" qui indique les paramètres
+            x264 utilisés pour l'encodage. Elle est affichée avant le premier bloc de progression,
+            les options sont donc disponibles au passage dans l'état ENCODING.
+            """
+            if "options:" not in line:
+                return
+            # Once options are found, remove the listener before any further processing
+            self._ffmpeg.remove_listener("stderr", on_x264_options)
+            options_str = line.partition("options:")[2].strip()
+            self._options_used = {
+                k: v for k, _, v in (tok.partition("=") for tok in options_str.split())
+            }
+
+        self._ffmpeg_listeners += [("stderr", on_progress), ("stderr", on_x264_options)]
+
+    def _notify_started(self):
+        # Les encodeurs matériels n'affichent pas de ligne "options:" : aucune option détaillée
+        if self._options_used is None:
+            self._options_used = {}
+        self._set_state(EncodingState.ENCODING)
+        if self.on_started_callback:
+            self.on_started_callback(self.input_mediainfo, self._options_used)
 
     def _handle_processing_result(self):
         if self._cancelled:
@@ -276,11 +404,17 @@ class VideoEncoder:
             self._set_state(EncodingState.COMPLETED)
             if self.on_progress_callback:
                 self.on_progress_callback(100, 0)
+            # Un seul probe du fichier de sortie, conservé pour output_mediainfo ; il n'est pas
+            # mis en cache, pour ne pas remplir les caches de chaque fichier produit
+            self._output_media_info = FFprobe(self._ffprobe_executable).probe(
+                self._output_path, use_cache=False
+            )
+            self._log(
+                f"Fichier de sortie {self._output_path} :\n" + self._output_media_info.summary_str
+            )
             if self.on_finished_callback:
                 self.on_finished_callback(
-                    True,
-                    "Encodage terminé avec succès !",
-                    FFprobe(self._ffprobe_executable).probe(self._output_path),
+                    True, "Encodage terminé avec succès !", self._output_media_info
                 )
         else:
             self._set_state(EncodingState.ERROR)
@@ -317,6 +451,11 @@ class VideoEncoder:
         if self._ffmpeg:
             return self._ffmpeg.media_info
 
+    @property
+    def output_mediainfo(self) -> MediaInfo | None:
+        """Informations du fichier produit, disponibles après un encodage réussi."""
+        return self._output_media_info
+
     def update_encoding_params(self, new_params: dict[str, Any]):
         if self.is_encoding or self.is_cancelling:
             raise VideoSettingError(
@@ -324,3 +463,9 @@ class VideoEncoder:
             )
 
         self._encoding_params.update(new_params)
+        if self._ffmpeg is not None:
+            # Les options de sortie sont figées dans la commande : le contexte est reconstruit
+            # aussitôt (input_mediainfo reste disponible, le probe étant en cache) et les
+            # observers attachés à l'ancien contexte sont oubliés
+            self._ffmpeg_listeners.clear()
+            self._ffmpeg = self._build_ffmpeg()
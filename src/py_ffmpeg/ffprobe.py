@@ -1,30 +1,122 @@
-import json
+import os
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from .config import default_media_info_cache, json_loads
 from .media_info import MediaInfo
 
+# Résultats de probe déjà obtenus, indexés par (chemin absolu, mtime_ns, taille, options) : un
+# fichier modifié change de clé et est donc ré-analysé. Les plus anciens sont évincés au-delà de
+# _PROBE_CACHE_MAX_ENTRIES (ordre d'insertion du dictionnaire, mis à jour à chaque accès)
+_PROBE_CACHE: dict[tuple[str, int, int, tuple[str, ...]], MediaInfo] = {}
+_PROBE_CACHE_MAX_ENTRIES = 256
+_PROBE_CACHE_LOCK = threading.Lock()
+
+
+def _cache_get(key: tuple[str, int, int, tuple[str, ...]]) -> MediaInfo | None:
+    with _PROBE_CACHE_LOCK:
+        media_info = _PROBE_CACHE.pop(key, None)
+        if media_info is not None:
+            _PROBE_CACHE[key] = media_info
+        return media_info
+
+
+def _cache_put(key: tuple[str, int, int, tuple[str, ...]], media_info: MediaInfo):
+    with _PROBE_CACHE_LOCK:
+        _PROBE_CACHE.pop(key, None)
+        _PROBE_CACHE[key] = media_info
+        while len(_PROBE_CACHE) > _PROBE_CACHE_MAX_ENTRIES:
+            del _PROBE_CACHE[next(iter(_PROBE_CACHE))]
+
 
 class FFprobe:
     """
     Service pour interagir avec l'exécutable ffprobe et analyser les fichiers médias.
     """
 
-    def __init__(self, executable: str = "ffprobe"):
+    def __init__(
+        self,
+        executable: str = "ffprobe",
+        fast_probe: bool = True,
+        analyze_duration_us: int = 1_000_000,
+        probe_size_bytes: int = 1_000_000,
+    ):
         self.executable = executable
+        # Fenêtre d'analyse réduite : suffisante pour les codecs, la résolution et la durée,
+        # sans lire plusieurs secondes du conteneur comme avec les valeurs par défaut
+        self._probe_args = (
+            ("-analyzeduration", str(analyze_duration_us), "-probesize", str(probe_size_bytes))
+            if fast_probe
+            else ()
+        )
+
+    @staticmethod
+    def clear_cache():
+        """
+        Vide le cache des résultats de probe partagé par toutes les instances, en mémoire comme
+        sur le disque (default_media_info_cache()).
+        """
+        with _PROBE_CACHE_LOCK:
+            _PROBE_CACHE.clear()
+        default_media_info_cache().clear()
 
-    def probe(self, filepath: str | Path) -> MediaInfo:
+    def probe(self, filepath: str | Path, use_cache: bool = True) -> MediaInfo:
         """
         Exécute ffprobe sur le chemin donné et retourne un objet MediaInfo structuré.
+        Avec `use_cache=False`, le résultat n'est ni lu ni enregistré dans les caches.
+        """
+        filepath = Path(filepath)
+        try:
+            st = os.stat(filepath)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Le fichier n'existe pas : {filepath}") from None
+        if not use_cache:
+            return self._run_probe(filepath, self._probe_args)
+        cache_key = (str(filepath.absolute()), st.st_mtime_ns, st.st_size, self._probe_args)
+        if (media_info := _cache_get(cache_key)) is not None:
+            return media_info
+
+        # Cache disque partagé avec EncodingConfig, désactivable par PY_FFMPEG_PROBE_CACHE
+        disk_cache = default_media_info_cache()
+        media_info = disk_cache.get(filepath, self._probe_args)
+        if media_info is not None:
+            _cache_put(cache_key, media_info)
+            return media_info
+
+        media_info = self._run_probe(filepath, self._probe_args)
+        _cache_put(cache_key, media_info)
+        disk_cache.put(filepath, media_info, self._probe_args)
+        return media_info
+
+    def probe_many(
+        self, filepaths: list[str | Path], max_workers: int | None = None
+    ) -> list[MediaInfo]:
+        """
+        Analyse plusieurs fichiers en parallèle (un processus ffprobe par fichier) et retourne les
+        MediaInfo dans l'ordre des chemins donnés. Les fichiers déjà en cache sont retournés
+        immédiatement.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            return list(executor.map(self.probe, filepaths))
+
+    def full_probe(self, filepath: str | Path) -> MediaInfo:
+        """
+        Comme probe(), mais avec la fenêtre d'analyse par défaut de ffprobe et sans passer par le
+        cache, pour les cas nécessitant des informations de stream exactes.
         """
         filepath = Path(filepath)
         if not filepath.exists():
             raise FileNotFoundError(f"Le fichier n'existe pas : {filepath}")
+        return self._run_probe(filepath, ())
 
+    def _run_probe(self, filepath: Path, probe_args: tuple[str, ...]) -> MediaInfo:
         command = [
             self.executable,
             "-v",
             "error",  # Moins verbeux que 'quiet' pour les erreurs, mais supprime les infos de base
+            *probe_args,
             "-print_format",
             "json",
             "-show_streams",
@@ -33,20 +125,69 @@ class FFprobe:
         ]
 
         try:
-            process = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                check=True,  # Lève CalledProcessError si le code de retour est non nul
-                encoding="utf-8",  # Assure un décodage correct
+            # stderr est normalement vide avec "-v error" : pas de pipe ni de lecture dédiée
+            process = subprocess.Popen(
+                command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
             )
-            raw_probe_data = json.loads(process.stdout)
-            return MediaInfo(filepath, raw_probe_data)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Erreur de décodage JSON de la sortie ffprobe : {e}") from e
+            stdout, _ = process.communicate()
+            if process.returncode:
+                # Relance, uniquement en cas d'échec, pour récupérer le diagnostic de ffprobe
+                diagnostic = subprocess.run(command, capture_output=True)
+                raise subprocess.CalledProcessError(
+                    process.returncode, command, stdout, diagnostic.stderr
+                )
         except subprocess.CalledProcessError as e:
             # Gérer spécifiquement les erreurs de ffprobe
-            error_msg = f"Erreur lors de l'exécution de ffprobe pour {filepath}:\n{e.stderr}"
+            stderr = e.stderr.decode("utf-8", errors="replace")
+            error_msg = f"Erreur lors de l'exécution de ffprobe pour {filepath}:\n{stderr}"
             raise RuntimeError(error_msg) from e
         except Exception as e:
             raise RuntimeError(f"Erreur inattendue lors du probing de {filepath}: {e}") from e
+
+        try:
+            # Sortie laissée en bytes : orjson (et json) décodent l'UTF-8 directement
+            raw_probe_data = json_loads(stdout)
+        except ValueError as e:  # json.JSONDecodeError et orjson.JSONDecodeError
+            raise ValueError(f"Erreur de décodage JSON de la sortie ffprobe : {e}") from e
+
+        try:
+            return MediaInfo(filepath, raw_probe_data)
+        except Exception as e:
+            raise RuntimeError(f"Erreur inattendue lors du probing de {filepath}: {e}") from e
+
+    def keyframes(self, filepath: str | Path) -> list[float]:
+        """
+        Retourne les timestamps (en secondes) des images clés du premier stream vidéo.
+        """
+        filepath = Path(filepath)
+        if not filepath.exists():
+            raise FileNotFoundError(f"Le fichier n'existe pas : {filepath}")
+
+        command = [
+            self.executable,
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-skip_frame",
+            "nokey",
+            "-show_entries",
+            "frame=pts_time",
+            "-of",
+            "csv=p=0",
+            str(filepath.absolute()),
+        ]
+
+        try:
+            process = subprocess.run(command, capture_output=True, text=True, check=True)
+        except subprocess.CalledProcessError as e:
+            error_msg = f"Erreur lors de la lecture des images clés de {filepath}:\n{e.stderr}"
+            raise RuntimeError(error_msg) from e
+        except OSError as e:  # Exécutable ffprobe introuvable ou non exécutable
+            raise RuntimeError(f"Impossible d'exécuter ffprobe ({self.executable}) : {e}") from e
+        # Les frames sans timestamp sont signalées par "N/A"
+        return [
+            float(line)
+            for line in (line.strip().rstrip(",") for line in process.stdout.splitlines())
+            if line and line != "N/A"
+        ]
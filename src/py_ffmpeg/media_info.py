@@ -1,8 +1,12 @@
-import re
+from collections.abc import Mapping, Sequence
 from datetime import datetime
-from fractions import Fraction
+from functools import cached_property
+from inspect import get_annotations
+from itertools import chain
+from math import gcd
 from pathlib import Path
-from typing import Any, get_type_hints
+from types import MappingProxyType
+from typing import Any
 
 from dateutil.parser import parse as parse_date
 from py_utils.datetime import (
@@ -21,6 +25,22 @@ from py_utils.misc import demultiply_value
 class _BaseInfo:
     """Classe de base pour les informations de média, fournissant une introspection."""
 
+    # Clés brutes de ffprobe copiées comme attributs d'instance, pour que leur lecture ne passe
+    # pas par __getattr__
+    _DIRECT_KEYS: tuple[str, ...] = ()
+
+    @classmethod
+    def _direct_keys(cls) -> tuple[str, ...]:
+        """Clés de _DIRECT_KEYS qui ne sont pas déjà exposées par une propriété de la classe."""
+        keys = cls.__dict__.get("_direct_keys_cache")
+        if keys is None:
+            keys = tuple(k for k in cls._DIRECT_KEYS if not hasattr(cls, k))
+            cls._direct_keys_cache = keys
+        return keys
+
+    def _copy_direct_keys(self, raw_data: dict[str, Any]):
+        self.__dict__.update({k: raw_data[k] for k in self._direct_keys() if k in raw_data})
+
     def get_available_properties(self) -> list[dict[str, Any]]:
         """
         Retourne une liste de dictionnaires décrivant les propriétés publiques
@@ -28,38 +48,92 @@ class _BaseInfo:
         Chaque dictionnaire contient:
         - 'name': Le nom de la propriété.
         - 'type': Le type de la propriété (ex: int, str, float, Optional[str]).
-        - 'calculated': True si c'est une propriété calculée (@property), False si un attribut direct.
+        - 'calculated': True si c'est une propriété calculée (@property ou @cached_property), False si
+          un attribut direct.
         - 'description': Docstring de la propriété si disponible.
         """
-        properties = []
-        # Obtenir toutes les méthodes et attributs de la classe
-        for name in dir(self.__class__):
-            if not name.startswith("_"):  # Ignorer les attributs privés/protégés
-                attr = getattr(self.__class__, name)
-                if isinstance(attr, property):
-                    # C'est une @property
-                    prop_info = {
-                        "name": name,
-                        "calculated": True,
-                        "description": (
-                            attr.__doc__.strip() if attr.__doc__ else "No description available."
-                        ),
-                        "type": str(
-                            get_type_hints(self.__class__).get(name, "Any")
-                        ),  # Obtenir le type hint
-                    }
-                    properties.append(prop_info)
-        return properties
+        cls = self.__class__
+        properties = _CLS_PROPS.get(cls)
+        if properties is None:
+            properties = _CLS_PROPS[cls] = _collect_class_properties(cls)
+        # Copie des dictionnaires : le cache est partagé par toutes les instances de la classe
+        return [dict(p) for p in properties]
+
+
+# Propriétés publiques de chaque classe, calculées au premier appel de get_available_properties
+_CLS_PROPS: dict[type, list[dict[str, Any]]] = {}
+
+
+def _collect_class_properties(cls: type) -> list[dict[str, Any]]:
+    properties = []
+    # Annotations brutes de la hiérarchie, sans évaluation des références (les plus spécifiques
+    # l'emportent) : seule leur représentation textuelle est utilisée
+    type_hints: dict[str, Any] = {}
+    for klass in reversed(cls.__mro__):
+        type_hints.update(get_annotations(klass))
+    # Obtenir toutes les méthodes et attributs de la classe
+    for name in dir(cls):
+        if not name.startswith("_"):  # Ignorer les attributs privés/protégés
+            attr = getattr(cls, name)
+            if isinstance(attr, (property, cached_property)):
+                # C'est une @property
+                prop_info = {
+                    "name": name,
+                    "calculated": True,
+                    "description": (
+                        attr.__doc__.strip() if attr.__doc__ else "No description available."
+                    ),
+                    "type": str(type_hints.get(name, "Any")),  # Obtenir le type hint
+                }
+                properties.append(prop_info)
+    return properties
+
+
+# Valeurs par défaut partagées (en lecture seule) des tags, dispositions et side data absents
+_EMPTY_DICT = MappingProxyType({})
+_EMPTY_LIST = ()
+
+# DAR des résolutions courantes dont les pixels ne sont pas carrés
+_COMMON_DARS = {(720, 576): "4/3", (960, 720): "16/9", (1440, 1080): "16/9"}
+
+
+def _ratio_str(num: int, den: int) -> str:
+    """Ratio réduit, au même format que str(Fraction) : 'n/d', ou 'n' si d vaut 1."""
+    g = gcd(num, den)
+    num, den = num // g, den // g
+    return str(num) if den == 1 else f"{num}/{den}"
 
 
 class StreamInfo(_BaseInfo):
     """Représente les informations d'un seul stream (vidéo, audio, etc.)."""
 
+    _DIRECT_KEYS = (
+        "codec_name",
+        "codec_type",
+        "profile",
+        "duration",
+        "bit_rate",
+        "sample_rate",
+        "channels",
+        "channel_layout",
+        "width",
+        "height",
+        "r_frame_rate",
+        "pix_fmt",
+        "sample_aspect_ratio",
+        "display_aspect_ratio",
+        "nb_frames",
+        "tags",
+        "disposition",
+        "side_data_list",
+        "index",
+    )
+
     def __init__(self, raw_stream_data: dict[str, Any]):
         self._raw_data = raw_stream_data
-
-    def get(self, key: str, default: Any = None) -> Any:
-        return self._raw_data.get(key, default)
+        # get(key, default) est directement la méthode dict.get des données brutes
+        self.get = raw_stream_data.get
+        self._copy_direct_keys(raw_stream_data)
 
     def __getattr__(self, name: str) -> Any:
         """Accès dynamique aux attributs du stream."""
@@ -72,36 +146,36 @@ class StreamInfo(_BaseInfo):
     @property
     def codec_type(self) -> str:
         """Type du codec (ex: 'video', 'audio')."""
-        return self.get("codec_type", "unknown")
+        return self._raw_data.get("codec_type", "unknown")
 
     @property
     def codec_name(self) -> str | None:
         """Nom du codec (ex: 'h264', 'aac')."""
-        return self.get("codec_name")
+        return self._raw_data.get("codec_name")
 
     @property
     def profile(self) -> str:
-        return self.get("profile", "")
+        return self._raw_data.get("profile", "")
 
     @property
     def index(self) -> int:
         """Index du stream."""
-        return self.get("index", -1)
+        return self._raw_data.get("index", -1)
 
     @property
-    def tags(self) -> dict[str, str]:
+    def tags(self) -> Mapping[str, str]:
         """Dictionnaire des tags du stream."""
-        return self.get("tags", {})
+        return self._raw_data.get("tags", _EMPTY_DICT)
 
     @property
-    def disposition(self) -> dict[str, int]:
+    def disposition(self) -> Mapping[str, int]:
         """Dictionnaire des dispositions du stream."""
-        return self.get("disposition", {})
+        return self._raw_data.get("disposition", _EMPTY_DICT)
 
     @property
-    def side_data_list(self) -> list[dict[str, Any]]:
+    def side_data_list(self) -> Sequence[dict[str, Any]]:
         """Liste des données secondaires du stream."""
-        return self.get("side_data_list", [])
+        return self._raw_data.get("side_data_list", _EMPTY_LIST)
 
     def get_available_properties(self) -> list[dict[str, Any]]:
         """
@@ -109,9 +183,10 @@ class StreamInfo(_BaseInfo):
         de l'objet StreamInfo, incluant celles déléguées.
         """
         props = super().get_available_properties()
+        known_names = {p["name"] for p in props}
         # Ajouter les clés directes de _raw_data comme propriétés "non calculées"
         for key in self._raw_data:
-            if key not in [p["name"] for p in props] and not key.startswith("_"):
+            if key not in known_names and not key.startswith("_"):
                 props.append(
                     {
                         "name": key,
@@ -140,37 +215,37 @@ class VideoStreamInfo(StreamInfo):
     @property
     def width(self) -> int:
         """Largeur de la vidéo en pixels."""
-        return self.get("width", 0)
+        return self._raw_data.get("width", 0)
 
     @property
     def height(self) -> int:
         """Hauteur de la vidéo en pixels."""
-        return self.get("height", 0)
+        return self._raw_data.get("height", 0)
 
     @property
     def resolution(self) -> str:
         """Résolution de la vidéo au format 'WxH'."""
         return f"{self.width}x{self.height}"
 
-    @property
+    @cached_property
     def frame_rate(self) -> float:
         """Fréquence d'images de la vidéo (frames par seconde)."""
-        rate_str = self.get("r_frame_rate", "0/1")
+        num, _, den = (self._raw_data.get("r_frame_rate") or "0/1").partition("/")
         try:
-            num, den = map(int, rate_str.split("/"))
-            return num / den if den != 0 else 0.0
+            num, den = int(num), int(den)
         except ValueError:
             return 0.0
+        return num / den if den else 0.0
 
     @property
     def frame_rate_str(self):
         """Fréquence d'images de la vidéo tel que représenté dans les metadata (généralement une fraction)."""
-        return self.get("r_frame_rate", "0/1")
+        return self._raw_data.get("r_frame_rate", "0/1")
 
     @property
     def bit_rate(self) -> int:
         """Débit binaire de la vidéo en bits par seconde."""
-        return int(self.get("bit_rate", 0))
+        return int(self._raw_data.get("bit_rate", 0))
 
     @property
     def bit_rate_human(self) -> str:
@@ -180,72 +255,75 @@ class VideoStreamInfo(StreamInfo):
     def byte_rate_human(self) -> str:
         return demultiply_value(self.bit_rate / 8) + "B/s"
 
+    @cached_property
+    def _sar_pair(self) -> tuple[int, int] | None:
+        """SAR sous forme (numérateur, dénominateur), ou None si la valeur brute n'est pas exploitable."""
+        raw_sar = self._raw_data.get("sample_aspect_ratio", "1:1")
+        num, _, den = raw_sar.replace(":", "/").partition("/")
+        try:
+            return int(num), int(den)
+        except ValueError:
+            return None
+
     @property
-    def sample_aspect_ratio(self) -> str | None:
+    def sample_aspect_ratio(self) -> str:
         """Ratio d'aspect des pixels (SAR)."""
-        return self.get("sample_aspect_ratio", "1/1").replace(":", "/")
+        if self._sar_pair is None:
+            return self._raw_data.get("sample_aspect_ratio", "1/1").replace(":", "/")
+        return f"{self._sar_pair[0]}/{self._sar_pair[1]}"
 
     @property
-    def sar(self) -> str | None:
+    def sar(self) -> str:
         """Ratio d'aspect des pixels (SAR)."""
         return self.sample_aspect_ratio
 
-    @property
+    @cached_property
     def display_aspect_ratio(self) -> str | None:
         """Ratio d'aspect d'affichage (DAR)."""
         if "display_aspect_ratio" in self._raw_data:
-            return self.get("display_aspect_ratio").replace(":", "/")
+            return self._raw_data.get("display_aspect_ratio").replace(":", "/")
 
         if not self.width or not self.height:
             return None
 
-        try:
-            sarf = Fraction(self.sample_aspect_ratio.replace(":", "/"))
-            darf = sarf * Fraction(self.width, self.height)
-            return str(darf)
-        except (ValueError, ZeroDivisionError):
-            pass
+        if self._sar_pair is not None and self._sar_pair[1]:
+            sar_num, sar_den = self._sar_pair
+            return _ratio_str(sar_num * self.width, sar_den * self.height)
 
         # NOTE : a priori on ne devrait jamais tomber sur ce code depuis les dernières modifications
         # Fallback pour les résolutions communes si SAR/DAR ne sont pas clairs
-        if self.width == 720 and self.height == 576:
-            return "4/3"
-        if self.width == 960 and self.height == 720:
-            return "16/9"
-        if self.width == 1440 and self.height == 1080:
-            return "16/9"
-
-        return str(Fraction(self.width, self.height))
+        return _COMMON_DARS.get((self.width, self.height)) or _ratio_str(self.width, self.height)
 
     @property
     def dar(self) -> str | None:
         """Ratio d'aspect d'affichage (DAR)."""
         return self.display_aspect_ratio
 
-    @property
+    @cached_property
     def nb_frames(self) -> int:
         """Nombre total de frames dans le stream vidéo."""
         if "nb_frames" in self._raw_data:
             return int(self._raw_data["nb_frames"])
 
-        # Fallback: calculer nb_frames à partir du framerate et de la durée
-        if self.frame_rate > 0 and self.duration > 0:
-            return int(self.main_video_stream.frame_rate * self.duration)
+        # Fallback: calculer nb_frames à partir du framerate et de la durée du stream
+        duration = float(self._raw_data.get("duration", 0.0))
+        if self.frame_rate > 0 and duration > 0:
+            return int(self.frame_rate * duration)
         return 0
 
-    @property
+    @cached_property
     def bits_per_pixel(self):
         """Nombre de bits par pixel (bpp)."""
-        try:
-            return round(self.bit_rate / self.frame_rate / self.width / self.height, 6)
-        except:
-            return 0.0
+        frame_rate, width, height = self.frame_rate, self.width, self.height
+        if frame_rate and width and height:
+            return round(self.bit_rate / (frame_rate * width * height), 6)
+        return 0.0
 
     @property
     def bpp(self):
         return self.bits_per_pixel
 
-    @property
+    @cached_property
     def rotation(self) -> int:
         """Rotation de la vidéo en degrés (0, 90, 180, 270)."""
         r = 0
@@ -269,17 +347,17 @@ class AudioStreamInfo(StreamInfo):
     @property
     def sample_rate(self) -> int:
         """Taux d'échantillonnage audio en Hz."""
-        return int(self.get("sample_rate", 0))
+        return int(self._raw_data.get("sample_rate", 0))
 
     @property
     def channels(self) -> int:
         """Nombre de canaux audio."""
-        return int(self.get("channels", 0))
+        return int(self._raw_data.get("channels", 0))
 
     @property
     def bit_rate(self) -> int:
         """Débit binaire audio en bits par seconde."""
-        return int(self.get("bit_rate", 0))
+        return int(self._raw_data.get("bit_rate", 0))
 
     @property
     def bit_rate_human(self) -> str:
@@ -287,17 +365,30 @@ class AudioStreamInfo(StreamInfo):
 
     @property
     def channel_layout(self) -> str:
-        return self.get("channel_layout", "")
+        return self._raw_data.get("channel_layout", "")
 
 
 class MediaFormatInfo(_BaseInfo):
     """Représente les informations du format global du média."""
 
+    _DIRECT_KEYS = (
+        "filename",
+        "nb_streams",
+        "format_name",
+        "format_long_name",
+        "start_time",
+        "duration",
+        "size",
+        "bit_rate",
+        "probe_score",
+        "tags",
+    )
+
     def __init__(self, raw_format_data: dict[str, Any]):
         self._raw_data = raw_format_data
-
-    def get(self, key: str, default: Any = None) -> Any:
-        return self._raw_data.get(key, default)
+        # get(key, default) est directement la méthode dict.get des données brutes
+        self.get = raw_format_data.get
+        self._copy_direct_keys(raw_format_data)
 
     def __getattr__(self, name: str) -> Any:
         """Accès dynamique aux attributs du stream."""
@@ -310,17 +401,17 @@ class MediaFormatInfo(_BaseInfo):
     @property
     def duration(self) -> float:
         """Durée totale du média en secondes."""
-        return float(self.get("duration", 0.0))
+        return float(self._raw_data.get("duration", 0.0))
 
     @property
     def size(self) -> int:
         """Taille totale du média en octets."""
-        return int(self.get("size", 0))
+        return int(self._raw_data.get("size", 0))
 
     @property
-    def tags(self) -> dict[str, str]:
+    def tags(self) -> Mapping[str, str]:
         """Dictionnaire des tags du format global."""
-        return self.get("tags", {})
+        return self._raw_data.get("tags", _EMPTY_DICT)
 
     def get_available_properties(self) -> list[dict[str, Any]]:
         """
@@ -328,8 +419,9 @@ class MediaFormatInfo(_BaseInfo):
         de l'objet MediaInfo, incluant celles déléguées.
         """
         props = super().get_available_properties()
+        known_names = {p["name"] for p in props}
         for key in self._raw_data:
-            if key not in [p["name"] for p in props] and not key.startswith("_"):
+            if key not in known_names and not key.startswith("_"):
                 props.append(
                     {
                         "name": key,
@@ -370,6 +462,8 @@ class MediaInfo(_BaseInfo):
         }
         self.main_video_stream: VideoStreamInfo | None = None
         self.main_audio_stream: AudioStreamInfo | None = None
+        self._props_cache: list[dict[str, Any]] | None = None
+        self._delegation_map: dict[str, _BaseInfo] | None = None
 
         self._parse_streams()
         self._check_integrity()
@@ -425,7 +519,7 @@ class MediaInfo(_BaseInfo):
         """Chemin du fichier média."""
         return self.filepath
 
-    @property
+    @cached_property
     def duration(self) -> float:
         """Durée totale du média en secondes, déléguée à format.duration."""
         return self.format.duration
@@ -434,24 +528,25 @@ class MediaInfo(_BaseInfo):
         """Durée du média formatée en chaîne lisible par l'homme."""
         return duration_human(self.duration, short)
 
-    @property
+    @cached_property
     def size(self) -> int:
         """Taille du média en octets, déléguée à format.size avec fallback sur la taille du fichier."""
-        if self.format.size > 0:
-            return self.format.size
+        format_size = self.format.size
+        if format_size > 0:
+            return format_size
         return self.filepath.stat().st_size
 
     def size_human(self, unit="B") -> str:
         """Taille du média formatée en chaîne lisible par l'homme (KB, MB, GB)."""
         return demultiply_value(self.size) + unit
 
-    @property
+    @cached_property
     def creation_time(self) -> datetime:
         """Date et heure de création du média, extraite des tags ou du chemin du fichier."""
         dates = []
         # Chercher dans les tags du format
         for key, value in self.format.tags.items():
-            if re.search(r"(time|date)$", key, re.IGNORECASE):
+            if key.lower().endswith(("time", "date")):
                 try:
                     parsed_date = tzlocutc(parse_datetime(value))
                     dates.append(parsed_date)
@@ -484,32 +579,42 @@ class MediaInfo(_BaseInfo):
 
     @property
     def summary_str(self):
-        s = f"Durée : {self.duration_human()} - Taille : {self.size_human('o')}\n"
+        v, a = self.main_video_stream, self.main_audio_stream
+        parts = [f"Durée : {self.duration_human()} - Taille : {self.size_human('o')}\n"]
 
         # Construction de la ligne d'infos vidéo (si une piste existe)
-        if self.has_video_stream:
-            s += "video : "
-            s += f"{self.main_video_stream.codec_name} "
-            s += f"({self.main_video_stream.profile}) " if self.main_video_stream.profile else ""
-            s += f"{self.resolution} [SAR {self.sar} DAR {self.dar}] "
-            s += f"{self.main_video_stream.byte_rate_human} {self.frame_rate}fps [BPP {self.bpp}]\n"
+        if v is not None:
+            parts.append("video : ")
+            parts.append(f"{v.codec_name} ")
+            if v.profile:
+                parts.append(f"({v.profile}) ")
+            parts.append(f"{v.resolution} [SAR {v.sar} DAR {v.dar}] ")
+            parts.append(f"{v.byte_rate_human} {v.frame_rate}fps [BPP {v.bpp}]\n")
 
         # Construction et emission de la ligne d'infos audio (si une piste existe)
-        if self.has_audio_stream:
-            s += f"audio : "
-            s += f"{self.main_audio_stream.codec_name} "
-            s += f"({self.main_audio_stream.profile}) " if self.main_audio_stream.profile else ""
-            s += f"{self.channels}ch "
-            s += f"({self.channel_layout}) " if self.channel_layout else ""
-            s += f"{self.main_audio_stream.sample_rate}Hz {self.main_audio_stream.bit_rate_human}\n"
-
-        return s.strip()
+        if a is not None:
+            parts.append("audio : ")
+            parts.append(f"{a.codec_name} ")
+            if a.profile:
+                parts.append(f"({a.profile}) ")
+            parts.append(f"{a.channels}ch ")
+            if a.channel_layout:
+                parts.append(f"({a.channel_layout}) ")
+            parts.append(f"{a.sample_rate}Hz {a.bit_rate_human}\n")
+
+        return "".join(parts).strip()
 
     def __getattr__(self, name: str) -> Any:
         """
         Délègue l'accès aux attributs non trouvés à l'objet main_video_stream
         ou main_audio_stream si l'attribut est présent.
         """
+        if self._delegation_map is None:
+            self._delegation_map = self._build_delegation_map()
+        target = self._delegation_map.get(name)
+        if target is not None:
+            return getattr(target, name)
+
         if hasattr(self.format, name):
             return getattr(self.format, name)
         if self.main_video_stream and hasattr(self.main_video_stream, name):
@@ -523,11 +628,26 @@ class MediaInfo(_BaseInfo):
             f"and it's not found in main video/audio streams or format."
         )
 
+    def _build_delegation_map(self) -> dict[str, _BaseInfo]:
+        """Associe chaque nom connu à l'objet qui le porte, avec la même priorité que __getattr__."""
+        delegation_map = {}
+        # Parcours par priorité croissante : le format l'emporte sur la vidéo, elle-même sur l'audio
+        for target in (self.main_audio_stream, self.main_video_stream, self.format):
+            if target is not None:
+                delegation_map.update(dict.fromkeys(target.properties(), target))
+        return delegation_map
+
     def get_available_properties(self) -> list[dict[str, Any]]:
         """
         Retourne une liste de dictionnaires décrivant les propriétés publiques
         de l'objet MediaInfo, incluant celles déléguées.
+        Le résultat est calculé une seule fois, les appels suivants en retournent une copie.
         """
+        if self._props_cache is None:
+            self._props_cache = self._collect_available_properties()
+        return [dict(p) for p in self._props_cache]
+
+    def _collect_available_properties(self) -> list[dict[str, Any]]:
         props = super().get_available_properties()
 
         # Ajouter les propriétés des streams principaux (avec un préfixe)
@@ -573,6 +693,7 @@ class MediaInfo(_BaseInfo):
 
     def to_dict(self, include_raw: bool = False) -> dict[str, Any]:
         """Convertit l'objet MediaInfo en dictionnaire pour affichage ou sérialisation."""
+        v, a = self.main_video_stream, self.main_audio_stream
         data = {
             "path": str(self.filepath),
             "duration": self.duration,
@@ -587,36 +708,34 @@ class MediaInfo(_BaseInfo):
             "has_audio_stream": self.has_audio_stream,
         }
 
-        if self.main_video_stream:
+        if v:
             data["video_stream"] = {
-                "codec": self.main_video_stream.codec_name,
-                "resolution": self.main_video_stream.resolution,
-                "width": self.main_video_stream.width,
-                "height": self.main_video_stream.height,
-                "frame_rate": self.main_video_stream.frame_rate_str,
-                "bit_rate": demultiply_value(self.main_video_stream.bit_rate) + "b/s",
-                "rotation": self.main_video_stream.rotation,
-                "sample_aspect_ratio": self.main_video_stream.sample_aspect_ratio,
-                "display_aspect_ratio": self.main_video_stream.display_aspect_ratio,
-                "nb_frames": self.main_video_stream.nb_frames,
-                "bits_per_pixel": self.main_video_stream.bits_per_pixel,
+                "codec": v.codec_name,
+                "resolution": v.resolution,
+                "width": v.width,
+                "height": v.height,
+                "frame_rate": v.frame_rate_str,
+                "bit_rate": demultiply_value(v.bit_rate) + "b/s",
+                "rotation": v.rotation,
+                "sample_aspect_ratio": v.sample_aspect_ratio,
+                "display_aspect_ratio": v.display_aspect_ratio,
+                "nb_frames": v.nb_frames,
+                "bits_per_pixel": v.bits_per_pixel,
             }
-        if self.main_audio_stream:
+        if a:
             data["audio_stream"] = {
-                "codec": self.main_audio_stream.codec_name,
-                "channels": self.main_audio_stream.channels,
-                "sample_rate": demultiply_value(self.main_audio_stream.sample_rate) + "Hz",
-                "bit_rate": demultiply_value(self.main_audio_stream.bit_rate) + "b/s",
+                "codec": a.codec_name,
+                "channels": a.channels,
+                "sample_rate": demultiply_value(a.sample_rate) + "Hz",
+                "bit_rate": demultiply_value(a.bit_rate) + "b/s",
             }
 
         if include_raw:
             data["raw_format"] = self.format._raw_data
             data["raw_streams"] = [
                 s._raw_data
-                for s in self.streams["video"]
-                + self.streams["audio"]
-                + self.streams["data"]
-                + self.streams["chapters"]
-                + self.streams["subtitle"]
+                for s in chain.from_iterable(
+                    self.streams[k] for k in ("video", "audio", "data", "chapters", "subtitle")
+                )
             ]
         return data
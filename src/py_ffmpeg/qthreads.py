@@ -1,8 +1,11 @@
+from collections import deque
+
 from PySide6.QtCore import QObject, QThread, Signal
 
 from py_ffmpeg.media_info import MediaInfo
 
-from .encoder import EncodingState, VideoEncoder
+from .batch import BatchEncoder
+from .encoder import EncodingState, RateLimited, VideoEncoder
 
 
 class EncoderWorkerSignals(QObject):
@@ -16,16 +19,36 @@ class EncoderWorkerSignals(QObject):
 class EncoderWorker(QThread):
     """Worker thread to run the VideoEncoder in a separate thread."""
 
-    def __init__(self, video_encoder: VideoEncoder):
+    def __init__(
+        self,
+        video_encoder: VideoEncoder,
+        progress_interval: float = 0.0,
+        progress_buffer: deque[tuple[float, int]] | None = None,
+    ):
         super().__init__()
         self._encoder = video_encoder
         self.signals = EncoderWorkerSignals()
+        # Avec un progress_buffer, la progression y est déposée sans signal et le thread
+        # consommateur la relève à son rythme ; sinon elle est émise via progress_updated.
+        if progress_buffer is None:
+            emit_progress = self.signals.progress_updated.emit
+        else:
+
+            def emit_progress(percent: float, remaining: int):
+                progress_buffer.append((percent, remaining))
+
+        # Limitation des émissions de progression avant qu'elles ne traversent les threads
+        self._progress = RateLimited(emit_progress, progress_interval)
 
         self._encoder.on_log_callback = self.signals.log_updated.emit
         self._encoder.on_state_changed_callback = self.signals.state_changed.emit
         self._encoder.on_started_callback = self.signals.started_with_options.emit
-        self._encoder.on_progress_callback = self.signals.progress_updated.emit
-        self._encoder.on_finished_callback = self.signals.finished.emit
+        self._encoder.on_progress_callback = self._progress
+        self._encoder.on_finished_callback = self._on_finished
+
+    def _on_finished(self, success: bool, message: str, output_mediainfo: MediaInfo | None):
+        self._progress.flush()
+        self.signals.finished.emit(success, message, output_mediainfo)
 
     def run(self):
         self._encoder.start()
@@ -36,3 +59,34 @@ class EncoderWorker(QThread):
     @property
     def input_mediainfo(self):
         return self._encoder.input_mediainfo
+
+
+class BatchEncoderWorkerSignals(QObject):
+    log_updated = Signal(str, str)  # file_id, message
+    progress_updated = Signal(str, float, int)  # file_id, percent, remaining
+    state_changed = Signal(str, EncodingState)
+    started_with_options = Signal(str, MediaInfo, dict)  # file_id, input_mediainfo, options
+    file_finished = Signal(str, bool, str, MediaInfo)  # file_id, success, message
+    finished = Signal()
+
+
+class BatchEncoderWorker(QThread):
+    """Worker thread to run a BatchEncoder in a separate thread."""
+
+    def __init__(self, batch_encoder: BatchEncoder):
+        super().__init__()
+        self._batch = batch_encoder
+        self.signals = BatchEncoderWorkerSignals()
+
+        self._batch.on_log_callback = self.signals.log_updated.emit
+        self._batch.on_state_changed_callback = self.signals.state_changed.emit
+        self._batch.on_started_callback = self.signals.started_with_options.emit
+        self._batch.on_progress_callback = self.signals.progress_updated.emit
+        self._batch.on_finished_callback = self.signals.file_finished.emit
+
+    def run(self):
+        self._batch.start()
+        self.signals.finished.emit()
+
+    def cancel(self):
+        self._batch.cancel()